@@ -1,9 +1,14 @@
 """Backend server for Spotify integration with Stream Deck."""
 
 import time
+import hashlib
+import json
 import traceback
 import logging
 import threading
+from collections import OrderedDict, namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, partial
 from threading import Lock
 from io import BytesIO
 import os
@@ -11,27 +16,42 @@ import socket
 import sys
 from dotenv import load_dotenv
 
-import debugpy
-
 import spotipy
 from spotipy.oauth2 import SpotifyOAuth
 from PIL import Image, ImageDraw, ImageFont
 import requests
-from flask import Flask, send_file, request, jsonify
+import certifi
+import urllib3
+from flask import Flask, Response, request, jsonify
+from waitress import serve
 import platform
 
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
-from single_dial import SingleDialImageHandler
-from font_utils import get_unicode_font
+from single_dial import (
+    HEART_ICON_PATHS,
+    MESSAGE_IMAGE_CACHE_SIZE,
+    SingleDialImageHandler,
+    get_progress,
+)
+from font_utils import get_unicode_font, truncate_text
 
 # Constants
 PORT = 8491
+SERVER_THREADS = 8  # /player requests can block for seconds while polling Spotify
 DISABLE_FLASK_LOGS = True
 # before: 15 / 60
 REFRESH_RATE_PLAYING = 1     # schneller Poll bei Wiedergabe
 REFRESH_RATE_PAUSED  = 1     # gemächlicher Poll im Pause-Zustand
+REFRESH_RATE_IDLE = 5  # poll once nothing has played for IDLE_AFTER seconds
+IDLE_AFTER = 60
+ALBUM_ART_CACHE_SIZE = 16  # covers kept in memory, ~30 KB each at 100x100
+DEVICES_CACHE_TTL = 5  # seconds the inspector's device list is served from memory
+LIKED_CACHE_SIZE = 128  # liked status of recently played tracks
+LIKED_CACHE_TTL = 10 * 60  # seconds before a revisited track's liked status is rechecked
+PREMIUM_CHECK_TTL = 6 * 60 * 60  # seconds to trust the last account tier lookup
+JPEG_QUALITY = 85  # q=100 is ~3x the size and encode time with no visible gain on the LCD
 
 # Configure logging for debugging
 logging.basicConfig(
@@ -58,7 +78,11 @@ app = Flask(__name__)
 # Disable caching
 @app.after_request
 def add_no_cache_headers(resp):
-    resp.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
+    if resp.get_etag()[0]:
+        # Clients may keep tagged responses but must revalidate them every time
+        resp.headers['Cache-Control'] = 'no-cache'
+    else:
+        resp.headers['Cache-Control'] = 'no-store, no-cache, must-revalidate, max-age=0'
     resp.headers['Pragma'] = 'no-cache'
     resp.headers['Expires'] = '0'
     return resp
@@ -72,99 +96,312 @@ if DISABLE_FLASK_LOGS:
 # Load environment variables
 load_dotenv()
 
+# Encoded touchbar frame: full, left and right JPEG bytes plus their ETag
+ImageSnapshot = namedtuple("ImageSnapshot", ["full", "left", "right", "etag"])
+
+# Post-action refreshes run on one worker so /player can answer right away
+_refresh_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="refresh")
+_refresh_lock = Lock()
+_refresh_pending = False
+
+# Main loop renders run on their own worker so a slow frame never delays polling;
+# only the newest queued job is kept, see _schedule_render()
+_render_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="render")
+_render_lock = Lock()
+_render_job = None
+
+# Last account tier lookup, see _check_premium()
+_is_premium = False
+_premium_checked_at = 0.0
+
+# Last serialized /devices response, see get_devices()
+_devices_response = None
+_devices_fetched_at = 0.0
+_devices_lock = Lock()
+
+# Album art for a new track starts downloading as soon as the track is seen
+_ALBUM_ART_PREFETCH = ThreadPoolExecutor(max_workers=2, thread_name_prefix="album-art")
+
+# Album art comes from a public CDN: a bare connection pool is all it needs.
+# Verify against certifi like requests does; python.org macOS builds have an
+# empty OpenSSL store until "Install Certificates" is run
+_ALBUM_ART_POOL = urllib3.PoolManager(
+    num_pools=2, maxsize=8, retries=False, ca_certs=certifi.where()
+)
+
+
+def _create_pause_overlay(fill, bar_width):
+    """Draw a 100x100 RGBA overlay with two centered pause bars."""
+    overlay = Image.new("RGBA", (100, 100), fill)
+    draw_overlay = ImageDraw.Draw(overlay)
+
+    bar_height = 30
+    spacing = 10
+    start_x = (100 - (2 * bar_width + spacing)) // 2
+    start_y = (100 - bar_height) // 2
+
+    for x in (start_x, start_x + bar_width + spacing):
+        draw_overlay.rectangle(
+            [x, start_y, x + bar_width, start_y + bar_height],
+            fill="white",
+        )
+
+    return overlay
+
+
+# The pause overlays never change, so draw them once
+_PAUSE_OVERLAY = _create_pause_overlay((0, 0, 0, 128), bar_width=10)
+_PAUSE_OVERLAY_NO_TRACK = _create_pause_overlay((0, 0, 0, 0), bar_width=12)
+
+
+@lru_cache(maxsize=64)
+def _render_text(text, size, color, max_width):
+    """Render truncated text once into a transparent sprite.
+
+    Returns the sprite and its x offset, negative when the first glyph
+    overhangs the origin. Track and artist names stay the same for the
+    whole track, so every later frame only pastes the cached sprite.
+    """
+    font = get_unicode_font(size)
+    text = truncate_text(text, font, max_width)
+    left, _, right, bottom = font.getbbox(text)
+    offset = -min(left, 0)
+    sprite = Image.new("RGBA", (max(right + offset, 1), max(bottom, 1)), (0, 0, 0, 0))
+    ImageDraw.Draw(sprite).text((offset, 0), text, fill=color, font=font)
+    return sprite, -offset
+
+
+def _paste_text(background, position, text, size, color, max_width):
+    """Paste cached rendered text at the position draw.text() would use."""
+    sprite, offset = _render_text(text, size, color, max_width)
+    background.paste(sprite, (position[0] + offset, position[1]), sprite)
+
+
+def _add_track_info(background, track_data):
+    """Add track name and artist information."""
+    # Add track name
+    _paste_text(background, (120, 15), track_data["track_name"], 20, "white", 260)
+
+    # Add artists
+    _paste_text(background, (120, 45), track_data["artists"], 16, "#B3B3B3", 260)
+
 
 class SpotifyImageHandler:
     """Handles image generation and storage for Stream Deck display."""
 
     def __init__(self, spotify_client):
-        self.left_image = None
-        self.right_image = None
-        self.full_image = None
+        # Published ImageSnapshot, replaced as a whole so readers need no lock
+        self.snapshot = None
+        # Guards the render key and message cache on the writer side
         self.image_lock = Lock()
         # Initialize timing attributes
         self.current_track_start_time = None
         self.current_track_duration = None
         self.spotify_client = spotify_client
-        # Add image cache
-        self.album_art_cache = {}
-        self.current_image_url = None
+        # LRU cache of resized album art, keyed by image URL
+        self.album_art_cache = OrderedDict()
+        self.album_art_lock = Lock()
+        self._album_art_downloads = {}  # image URL -> Future of the download
+        # Key of the track frame currently published, reset by other images
+        self._last_render_key = None
+        # (key, image) of the current track frame without its progress bar
+        self._track_base = None
+        # Encoded login/error/no-track snapshots, keyed by message
+        self.message_image_cache = OrderedDict()
+        # Liked/not liked icons, decoded and resized once instead of per frame
+        self.heart_icons = {
+            is_liked: self._load_heart_icon(icon_path)
+            for is_liked, icon_path in HEART_ICON_PATHS.items()
+        }
+
+    def estimated_progress(self, now):
+        """Extrapolate the playback ratio from the recorded track timing, or None."""
+        start_time = self.current_track_start_time
+        duration = self.current_track_duration
+        if not start_time or not duration:
+            return None
+        return min((now - start_time) / duration, 1.0)
 
-    def create_progress_bar(self, draw, current_progress):
+    def progress_width(self, current_progress):
+        """Return the filled progress bar width in pixels, or None if unknown."""
+        if current_progress is None:
+            return None
+        return int(220 * current_progress)
+
+    def create_progress_bar(self, draw, progress_width):
         """Draw progress bar on the image."""
         # Draw background
         draw.rounded_rectangle([120, 75, 340, 80], radius=1, fill="#404040")
 
         # Draw progress
-        if current_progress is not None:
-            progress_width = int(220 * current_progress)
+        if progress_width is not None:
             draw.rounded_rectangle(
                 [120, 75, 120 + progress_width, 80], radius=1, fill="#1DB954"
             )
 
-    def add_heart_icon(self, background, is_liked):
-        """Add heart icon to the image."""
-        # Choose the appropriate PNG file based on liked status
-        icon_filename = "spotify-liked.png" if is_liked else "spotify-like.png"
-        icon_path = os.path.join(os.path.dirname(__file__), icon_filename)
-        
+    def _load_heart_icon(self, icon_path):
+        """Load a heart icon resized to 20x20, or None if it can't be read."""
         try:
-            # Load and resize the PNG image
             heart_image = Image.open(icon_path)
-            heart_image = heart_image.resize((20, 20), Image.Resampling.LANCZOS)
-            
-            # Paste the image with transparency support
-            if heart_image.mode == 'RGBA':
-                background.paste(heart_image, (360, 65), heart_image)
-            else:
-                background.paste(heart_image, (360, 65))
+            return heart_image.resize((20, 20), Image.Resampling.LANCZOS)
         except FileNotFoundError:
             logger.warning(f"Heart icon file not found: {icon_path}")
         except Exception as e:
             logger.error(f"Error loading heart icon: {str(e)}")
+        return None
+
+    def add_heart_icon(self, background, is_liked):
+        """Add heart icon to the image."""
+        heart_image = self.heart_icons[bool(is_liked)]
+        if heart_image is None:
+            return
+
+        # Paste the image with transparency support
+        if heart_image.mode == 'RGBA':
+            background.paste(heart_image, (360, 65), heart_image)
+        else:
+            background.paste(heart_image, (360, 65))
+
+    def save_images(self, background, cache_key=None):
+        """Save the full, left and right images.
+
+        Images saved with a cache_key can be published again later with
+        publish_cached_images() without being redrawn or re-encoded.
+        """
+        # Encode outside the lock so image requests never wait on libjpeg.
+        # Every canvas is created as RGB, so it can be encoded as is.
+        images = (
+            self.encode_jpeg(background),
+            self.encode_jpeg(background.crop((0, 0, 200, 100))),
+            self.encode_jpeg(background.crop((200, 0, 400, 100))),
+        )
 
-    def save_images(self, background):
-        """Save the full, left and right images."""
+        # Publish all three together
+        with self.image_lock:
+            self._publish_images(images)
+            if cache_key is not None:
+                self.message_image_cache[cache_key] = self.snapshot
+                if len(self.message_image_cache) > MESSAGE_IMAGE_CACHE_SIZE:
+                    self.message_image_cache.popitem(last=False)
+        logger.debug("Images saved successfully")
+
+    def publish_cached_images(self, cache_key):
+        """Publish images previously saved under cache_key, if any."""
         with self.image_lock:
-            logger.debug("Image lock acquired, saving images")
-            self.full_image = BytesIO()
-            background = background.convert("RGB")
-            background.save(self.full_image, format="JPEG", quality=100)
-            self.full_image.seek(0)
+            snapshot = self.message_image_cache.get(cache_key)
+            if snapshot is None:
+                return False
+            self.message_image_cache.move_to_end(cache_key)
+            # Already encoded and tagged, republishing is a reference swap
+            self.snapshot = snapshot
+            self._last_render_key = None
+        return True
+
+    def _publish_images(self, images):
+        """Publish a (full, left, right) image set, caller holds image_lock."""
+        # The halves are crops of the full image, so one validator covers all three
+        etag = hashlib.blake2b(images[0], digest_size=8).hexdigest()
+        # A single reference store, readers see either the old or the new set
+        self.snapshot = ImageSnapshot(*images, etag)
+        self._last_render_key = None
+
+    def encode_jpeg(self, image):
+        """Encode an RGB image as JPEG and return the immutable bytes."""
+        buffer = BytesIO()
+        image.save(
+            buffer, format="JPEG", quality=JPEG_QUALITY, optimize=False, subsampling=2
+        )
+        return buffer.getvalue()
+
+    def prefetch_album_art(self, image_url):
+        """Start downloading album art in the background if it isn't cached yet."""
+        with self.album_art_lock:
+            if image_url in self.album_art_cache or image_url in self._album_art_downloads:
+                return
+        # The render joins this download through get_album_art's in-flight future;
+        # a failed prefetch is simply retried by the render that needs the cover
+        _ALBUM_ART_PREFETCH.submit(self.get_album_art, image_url)
+
+    def get_album_art(self, image_url):
+        """Return the 100x100 album art for a URL, downloading it on a cache miss."""
+        with self.album_art_lock:
+            album_art = self.album_art_cache.get(image_url)
+            if album_art is not None:
+                self.album_art_cache.move_to_end(image_url)
+                return album_art
+
+            # Only one thread downloads a given cover, the others wait for it
+            download = self._album_art_downloads.get(image_url)
+            is_downloader = download is None
+            if is_downloader:
+                download = Future()
+                self._album_art_downloads[image_url] = download
+
+        if not is_downloader:
+            logger.debug("Waiting for album art download in progress")
+            return download.result(timeout=10)
+
+        try:
+            album_art = self._download_album_art(image_url)
+        except Exception as e:
+            with self.album_art_lock:
+                del self._album_art_downloads[image_url]
+            download.set_exception(e)
+            raise
+
+        with self.album_art_lock:
+            self.album_art_cache[image_url] = album_art
+            if len(self.album_art_cache) > ALBUM_ART_CACHE_SIZE:
+                self.album_art_cache.popitem(last=False)
+            del self._album_art_downloads[image_url]
+        download.set_result(album_art)
+        return album_art
+
+    def _download_album_art(self, image_url):
+        """Download album art and resize it to 100x100."""
+        logger.debug("Downloading new album art")
+        try:
+            response = _ALBUM_ART_POOL.request("GET", image_url, timeout=10.0)
+        except urllib3.exceptions.HTTPError as e:
+            raise IOError(f"Album art download failed: {str(e)}") from e
+        logger.debug(f"Album art downloaded, status: {response.status}")
+        if response.status != 200:
+            raise IOError(f"Album art download failed with status {response.status}")
+        # BytesIO shares the downloaded bytes, Pillow reads them without a copy
+        album_art = Image.open(BytesIO(response.data))
+        # JPEG covers (640x640) can be decoded straight at a reduced DCT scale,
+        # still at least 100x100, instead of decoding every pixel then shrinking
+        album_art.draft("RGB", (100, 100))
+        # Normalize once so every canvas stays RGB and needs no conversion on save
+        if album_art.mode != "RGB":
+            album_art = album_art.convert("RGB")
+        # BOX averages each source area: suited to a large downscale, cheaper than BICUBIC
+        return album_art.resize((100, 100), Image.Resampling.BOX)
+
+    def track_base_image(self, track_data, is_liked):
+        """Return the track frame minus the progress bar, composed once per state."""
+        key = (track_data["track_id"], track_data.get("is_playing", True), is_liked)
+        track_base = self._track_base
+        if track_base is not None and track_base[0] == key:
+            return track_base[1]
 
-            # Split and save left/right images
-            left_half = background.crop((0, 0, 200, 100))
-            right_half = background.crop((200, 0, 400, 100))
+        background = Image.new("RGB", (400, 100), "black")
 
-            self.left_image = BytesIO()
-            self.right_image = BytesIO()
+        # Add album art and track info
+        self._add_album_art(background, track_data)
+        _add_track_info(background, track_data)
 
-            left_half = left_half.convert("RGB")
-            right_half = right_half.convert("RGB")
+        # Add heart icon with cached liked status
+        self.add_heart_icon(background, is_liked)
 
-            left_half.save(self.left_image, format="JPEG", quality=100)
-            right_half.save(self.right_image, format="JPEG", quality=100)
-            self.left_image.seek(0)
-            self.right_image.seek(0)
-            logger.debug("Images saved successfully")
+        self._track_base = (key, background)
+        return background
 
     def _add_album_art(self, background, track_data):
         """Add album art to the background image with caching."""
         image_url = track_data["image_url"]
-        logger.debug(f"Adding album art from URL: {image_url[:50]}...")
-
-        # Use cached image if URL hasn't changed
-        if image_url == self.current_image_url and image_url in self.album_art_cache:
-            album_art = self.album_art_cache[image_url]
-        else:
-            # Download and cache new image
-            logger.debug("Downloading new album art")
-            response = requests.get(image_url, timeout=10)
-            logger.debug(f"Album art downloaded, status: {response.status_code}")
-            album_art = Image.open(BytesIO(response.content))
-            album_art = album_art.resize((100, 100))
-            # Update cache
-            self.album_art_cache = {image_url: album_art}  # Only keep latest image
-            self.current_image_url = image_url
+        logger.debug("Adding album art from URL: %.50s...", image_url)
+        album_art = self.get_album_art(image_url)
 
         background.paste(album_art, (0, 0))
 
@@ -173,60 +410,13 @@ class SpotifyImageHandler:
 
     def _add_pause_overlay(self, background):
         """Add pause overlay to album art."""
-        overlay = Image.new("RGBA", (100, 100), (0, 0, 0, 128))
-        draw_overlay = ImageDraw.Draw(overlay)
-
-        bar_width = 10
-        bar_height = 30
-        spacing = 10
-        start_x = (100 - (2 * bar_width + spacing)) // 2
-        start_y = (100 - bar_height) // 2
-
-        for x in (start_x, start_x + bar_width + spacing):
-            draw_overlay.rectangle(
-                [x, start_y, x + bar_width, start_y + bar_height],
-                fill="white",
-            )
-
-        background.paste(overlay, (0, 0), overlay)
-
-    def _add_track_info(self, draw, track_data):
-        """Add track name and artist information."""
-        title_font = get_unicode_font(20)
-        artist_font = get_unicode_font(16)
-
-        # Add track name
-        track_name = self._truncate_text(track_data["track_name"], title_font, 260)
-        draw.text((120, 15), track_name, fill="white", font=title_font)
-
-        # Add artists
-        artists = self._truncate_text(track_data["artists"], artist_font, 260)
-        draw.text((120, 45), artists, fill="#B3B3B3", font=artist_font)
-
-    def _truncate_text(self, text, font, max_width):
-        """Truncate text to fit within max_width."""
-        if font.getlength(text) > max_width:
-            while font.getlength(text + "...") > max_width:
-                text = text[:-1]
-            text += "..."
-        return text
-
-    def _get_progress(self, override_progress):
-        """Get current playback progress."""
-        if override_progress is not None:
-            return override_progress
-
-        current_playback = self.spotify_client.current_playback()
-        if current_playback:
-            current_progress_ms = current_playback["progress_ms"]
-            total_ms = current_playback["item"]["duration_ms"]
-            self.current_track_start_time = time.time() - (current_progress_ms / 1000)
-            self.current_track_duration = total_ms / 1000
-            return current_progress_ms / total_ms
-        return None
+        background.paste(_PAUSE_OVERLAY, (0, 0), _PAUSE_OVERLAY)
 
     def create_login_message_image(self):
         """Create an image showing login message."""
+        if self.publish_cached_images("login"):
+            return
+
         background = Image.new("RGB", (400, 100), "black")
         draw = ImageDraw.Draw(background)
 
@@ -243,10 +433,13 @@ class SpotifyImageHandler:
         y = (100 - text_height) // 2
 
         draw.text((x, y), message, fill="white", font=font)
-        self.save_images(background)
+        self.save_images(background, cache_key="login")
 
     def create_error_message_image(self, error_message):
         """Create an image showing error message."""
+        if self.publish_cached_images(("error", error_message)):
+            return
+
         background = Image.new("RGB", (400, 100), "black")
         draw = ImageDraw.Draw(background)
 
@@ -288,7 +481,7 @@ class SpotifyImageHandler:
             draw.text((x, y), line, fill="white", font=desc_font)
             y += 20
 
-        self.save_images(background)
+        self.save_images(background, cache_key=("error", error_message))
 
 
 class TrackState:
@@ -297,6 +490,9 @@ class TrackState:
     def __init__(self):
         self.current_id = None
         self.current_liked = False
+        # track id -> (liked, checked at), so revisited tracks need no lookup
+        self.liked_cache = OrderedDict()
+        self.liked_lock = Lock()
         self.last_info = None
         self.is_playing = False
         self.shuffle_state = False  # Added shuffle state
@@ -309,12 +505,14 @@ class VolumeState:
     """Class to hold volume-related state."""
 
     def __init__(self):
-        self.last_update = 0
         self.current = None
         self.last_rotate_time = 0
-        self.update_delay = 0.1
+        self.update_delay = 0.15  # Idle time after the last rotation before calling the API
         self.refresh_delay = 10.0
         self.last_unmuted_volume = 50  # Store the last unmuted volume
+        self.pending = None  # Volume waiting to be sent
+        self.flush_timer = None
+        self.lock = Lock()
 
 
 class SeekState:
@@ -330,6 +528,32 @@ class SeekState:
         self.pending_seek_ms = 0  # Accumulated seek amount
 
 
+class PlaybackCache:
+    """Class to share recent current_playback() results between callers."""
+
+    def __init__(self, sp, ttl=0.5):
+        self.sp = sp
+        self.ttl = ttl  # Bursts of button presses within this window share one call
+        self.value = None
+        self.timestamp = 0
+        self.lock = Lock()
+
+    def get(self):
+        """Return the playback state, fetching it if the cached one is too old."""
+        # Holding the lock while fetching lets concurrent callers share one call
+        with self.lock:
+            now = time.time()
+            if self.value is None or now - self.timestamp >= self.ttl:
+                self.value = self.sp.current_playback()
+                self.timestamp = now
+            return self.value
+
+    def invalidate(self):
+        """Force the next get() to fetch, after playback was changed."""
+        with self.lock:
+            self.value = None
+
+
 class SpotifyTrackInfo:
     """Handles Spotify track information and control."""
 
@@ -341,7 +565,9 @@ class SpotifyTrackInfo:
         )
 
         session = requests.Session()
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=retry_strategy
+        )
         session.mount("https://", adapter)
 
         scope = (
@@ -354,15 +580,20 @@ class SpotifyTrackInfo:
                 client_secret=os.getenv("SPOTIFY_CLIENT_SECRET"),
                 redirect_uri=os.getenv("SPOTIFY_REDIRECT_URI"),
                 scope=scope,
+                # Token refreshes go to accounts.spotify.com over the same pool
+                requests_session=session,
+                requests_timeout=10,
             ),
             requests_session=session,
             requests_timeout=10,
         )
+        self.playback = PlaybackCache(self.sp)
         self.image_handler = SpotifyImageHandler(self.sp)
         self.single_dial = SingleDialImageHandler(self, self.image_handler)
         self.track = TrackState()
         self.volume = VolumeState()
         self.seek = SeekState()
+        self.rate_limited_until = 0  # set from Retry-After when Spotify answers 429
 
     def _format_retry_time(self, seconds):
         """Format seconds into readable time format (e.g., 2h 30m 15s)."""
@@ -392,93 +623,71 @@ class SpotifyTrackInfo:
 
         self.image_handler.save_images(background)
 
+    def render_track_images(self, current_track_info, override_progress=None):
+        """Render the touchbar and single dial images for the current track."""
+        # Both share the album art cache, so the cover is decoded only once
+        progress = get_progress(current_track_info, override_progress)
+        self.create_status_images(current_track_info, progress)
+        self.single_dial.create_single_dial_image(current_track_info, progress)
+
     def create_status_images(self, current_track_info, override_progress=None):
         """Create status images for Stream Deck display."""
         try:
-            # Create base image
-            background = Image.new("RGB", (400, 100), "black")
-            draw = ImageDraw.Draw(background)
-
-            # Add album art and track info
-            self.image_handler._add_album_art(background, current_track_info)
-            self._add_track_info(draw, current_track_info)
-
-            # Add progress bar
-            current_progress = self._get_progress(override_progress)
-            self.image_handler.create_progress_bar(draw, current_progress)
+            current_progress = get_progress(current_track_info, override_progress)
 
             # Check if track changed and update liked status if needed
             track_id = current_track_info["track_id"]
-            if track_id != self.track.current_id:
-                self.track.current_id = track_id
-                self.track.current_liked = self.sp.current_user_saved_tracks_contains(
-                    [track_id]
-                )[0]
+            self.sync_liked_status(track_id)
+
+            # Skip rendering if the frame would be identical to the last one;
+            # the bar only moves when its width changes by a whole pixel
+            progress_width = self.image_handler.progress_width(current_progress)
+            render_key = (
+                track_id,
+                progress_width,
+                current_track_info.get("is_playing", True),
+                self.track.current_liked,
+            )
+            if render_key == self.image_handler._last_render_key:
+                return True
 
-            # Add heart icon with cached liked status
-            self.image_handler.add_heart_icon(background, self.track.current_liked)
+            # Only the progress bar changes between ticks of the same track
+            background = self.image_handler.track_base_image(
+                current_track_info, self.track.current_liked
+            ).copy()
+
+            # Add progress bar
+            self.image_handler.create_progress_bar(ImageDraw.Draw(background), progress_width)
 
             # Save images
             self.image_handler.save_images(background)
+            self.image_handler._last_render_key = render_key
             return True
 
         except (requests.RequestException, IOError, ValueError) as e:
             logger.error(f"Error creating images: {str(e)}")
             return False
 
-    def _add_track_info(self, draw, track_data):
-        """Add track name and artist information."""
-        title_font = get_unicode_font(20)
-        artist_font = get_unicode_font(16)
-
-        # Add track name
-        track_name = self._truncate_text(track_data["track_name"], title_font, 260)
-        draw.text((120, 15), track_name, fill="white", font=title_font)
-
-        # Add artists
-        artists = self._truncate_text(track_data["artists"], artist_font, 260)
-        draw.text((120, 45), artists, fill="#B3B3B3", font=artist_font)
-
-    def _truncate_text(self, text, font, max_width):
-        """Truncate text to fit within max_width."""
-        if font.getlength(text) > max_width:
-            while font.getlength(text + "...") > max_width:
-                text = text[:-1]
-            text += "..."
-        return text
-
-    def _get_progress(self, override_progress):
-        """Get current playback progress."""
-        if override_progress is not None:
-            logger.debug(f"Using override progress: {override_progress}")
-            return override_progress
-
-        logger.debug("Getting current playback progress from API")
-        current_playback = self.sp.current_playback()
-        if current_playback:
-            current_progress_ms = current_playback["progress_ms"]
-            total_ms = current_playback["item"]["duration_ms"]
-            self.image_handler.current_track_start_time = time.time() - (
-                current_progress_ms / 1000
-            )
-            self.image_handler.current_track_duration = total_ms / 1000
-            return current_progress_ms / total_ms
-        return None
-
     def get_current_track_info(self):
         """Get current track information from Spotify."""
         logger.debug("Getting current track info from Spotify API")
         try:
-            current_track = self.sp.current_user_playing_track()
+            # Single poll: playback state also carries shuffle, volume and progress
+            current_track = self.playback.get()
             logger.debug("Spotify API call for current track completed")
 
             if current_track is not None and current_track["item"] is not None:
-                # Update playing state
-                self.track.is_playing = current_track["is_playing"]
-                logger.debug(f"Track found: {current_track['item']['name']}, playing: {self.track.is_playing}")
+                image_url = current_track["item"]["album"]["images"][0]["url"]
+                # Start the cover download before the snapshot update, whose
+                # liked-status lookup may block on its own Spotify request
+                self.image_handler.prefetch_album_art(image_url)
+
+                # Update playing state and the rest of the shared snapshot
+                self._update_playback_snapshot(current_track)
+                logger.debug("Track found: %s, playing: %s", current_track['item']['name'], self.track.is_playing)
                 track_data = {
                     "track_name": current_track["item"]["name"],
-                    "image_url": current_track["item"]["album"]["images"][0]["url"],
+                    "image_url": image_url,
                     "artists": ", ".join(
                         [artist["name"] for artist in current_track["item"]["artists"]]
                     ),
@@ -502,7 +711,9 @@ class SpotifyTrackInfo:
         ) as e:
             self.track.is_playing = False
             if hasattr(e, 'http_status') and e.http_status == 429:  # Too Many Requests
-                retry_after = int(e.headers.get("Retry-After", 1))
+                retry_after = int((e.headers or {}).get("Retry-After", 1))
+                # Polling before Retry-After only extends the block
+                self.rate_limited_until = time.time() + retry_after
                 formatted_time = self._format_retry_time(retry_after)
                 error_msg = f"Rate limited. Retry after {formatted_time}"
                 logger.warning(error_msg)
@@ -514,6 +725,9 @@ class SpotifyTrackInfo:
 
     def create_no_track_image(self):
         """Create an image showing no track is playing with pause layout."""
+        if self.image_handler.publish_cached_images("no_track"):
+            return
+
         background = Image.new("RGB", (400, 100), "black")
         draw = ImageDraw.Draw(background)
 
@@ -538,26 +752,11 @@ class SpotifyTrackInfo:
         self.image_handler.add_heart_icon(background, False)
 
         # Save images
-        self.image_handler.save_images(background)
+        self.image_handler.save_images(background, cache_key="no_track")
 
     def _add_pause_overlay_no_track(self, background):
         """Add pause overlay to empty album art area."""
-        overlay = Image.new("RGBA", (100, 100), (0, 0, 0, 0))  # Transparent background
-        draw_overlay = ImageDraw.Draw(overlay)
-
-        bar_width = 12
-        bar_height = 30
-        spacing = 10
-        start_x = (100 - (2 * bar_width + spacing)) // 2
-        start_y = (100 - bar_height) // 2
-
-        for x in (start_x, start_x + bar_width + spacing):
-            draw_overlay.rectangle(
-                [x, start_y, x + bar_width, start_y + bar_height],
-                fill="white",
-            )
-
-        background.paste(overlay, (0, 0), overlay)
+        background.paste(_PAUSE_OVERLAY_NO_TRACK, (0, 0), _PAUSE_OVERLAY_NO_TRACK)
 
     def list_devices(self):
         """Get and print all available Spotify devices."""
@@ -637,11 +836,14 @@ class SpotifyTrackInfo:
                 self.sp.current_user_saved_tracks_add([self.track.current_id])
 
             # Update cached status
-            self.track.current_liked = not self.track.current_liked
+            with self.track.liked_lock:
+                self.track.current_liked = not self.track.current_liked
+                self._remember_liked(
+                    self.track.current_id, self.track.current_liked, time.time()
+                )
 
             # Immédiatement recréer les images avec le nouveau statut
-            self.create_status_images(current_track_info)
-            self.single_dial.create_single_dial_image(current_track_info)
+            self.render_track_images(current_track_info)
 
             return {
                 "status": "success",
@@ -653,33 +855,53 @@ class SpotifyTrackInfo:
             logger.error(f"Error toggling like status: {str(e)}")
             return {"status": "error", "message": str(e)}, 500
 
-    def update_button_states(self):
-        """Update all button states based on current playback."""
-        logger.debug("Updating button states")
-        try:
-            current_playback = self.sp.current_playback()
-            logger.debug("Got current playback for button states")
-            if not current_playback:
-                return False
+    def _update_playback_snapshot(self, current_playback):
+        """Update track, volume and timing state from a current_playback() result."""
+        now = time.time()
+        self.track.is_playing = current_playback["is_playing"]
+        self.track.shuffle_state = current_playback.get("shuffle_state", False)
 
-            is_playing = current_playback.get("is_playing", False)
-            is_shuffle = current_playback.get("shuffle_state", False)
-            is_muted = current_playback["device"]["volume_percent"] == 0
+        # Keep the locally echoed volume while the user is rotating the dial
+        device = current_playback.get("device")
+        if device and now - self.volume.last_rotate_time > self.volume.refresh_delay:
+            self.volume.current = device["volume_percent"]
 
-            # Get current track's like status
-            track_id = current_playback["item"]["id"]
-            is_liked = self.sp.current_user_saved_tracks_contains([track_id])[0]
+        item = current_playback["item"]
+        self.image_handler.current_track_start_time = now - (
+            current_playback["progress_ms"] / 1000
+        )
+        self.image_handler.current_track_duration = item["duration_ms"] / 1000
+
+        # Liked status only changes with the track (or through our own toggle)
+        self.sync_liked_status(item["id"])
+
+    def sync_liked_status(self, track_id):
+        """Point the liked status at track_id, asking Spotify only when needed."""
+        # The touchbar and single dial sync the same new track back to back;
+        # the second waits here and finds the first's answer in the liked LRU,
+        # which is trusted for LIKED_CACHE_TTL before asking Spotify again
+        with self.track.liked_lock:
+            if track_id == self.track.current_id:
+                return
+
+            now = time.time()
+            cached = self.track.liked_cache.get(track_id)
+            if cached is not None and now - cached[1] < LIKED_CACHE_TTL:
+                liked = cached[0]
+                self.track.liked_cache.move_to_end(track_id)
+            else:
+                liked = self.sp.current_user_saved_tracks_contains([track_id])[0]
+                self._remember_liked(track_id, liked, now)
 
-            # Update the existing state objects
-            self.track.is_playing = is_playing
-            self.track.current_liked = is_liked
-            self.track.shuffle_state = is_shuffle
-            
-            logger.debug("Button states updated successfully")
-            return True
-        except Exception as e:
-            logger.error(f"Error updating button states: {str(e)}")
-            return False
+            self.track.current_id = track_id
+            self.track.current_liked = liked
+
+    def _remember_liked(self, track_id, liked, now):
+        """Store a liked status in the LRU cache, caller holds liked_lock."""
+        self.track.liked_cache[track_id] = (liked, now)
+        self.track.liked_cache.move_to_end(track_id)
+        if len(self.track.liked_cache) > LIKED_CACHE_SIZE:
+            self.track.liked_cache.popitem(last=False)
 
     def handle_player_action(self, action_type):
         """Handle player actions."""
@@ -765,69 +987,61 @@ class SpotifyTrackInfo:
 # Create SpotifyTrackInfo instance before Flask routes
 spotify_info = SpotifyTrackInfo()
 
-@app.route("/left", methods=["GET"])
-def serve_left():
-    """Serve the left image for Stream Deck display."""
-    # logger.debug("Request for left image received")
-    try:
-        with spotify_info.image_handler.image_lock:
-            if spotify_info.image_handler.left_image:
-                img_copy = BytesIO(spotify_info.image_handler.left_image.getvalue())
-                return send_file(img_copy, mimetype="image/jpeg")
-        return "Image not found", 404
-    except IOError as e:
-        logger.error(f"Error serving left image: {str(e)}")
-        return str(e), 500
-
-
-@app.route("/right", methods=["GET"])
-def serve_right():
-    """Serve the right image for Stream Deck display."""
-    # logger.debug("Request for right image received")
-    try:
-        with spotify_info.image_handler.image_lock:
-            if spotify_info.image_handler.right_image:
-                img_copy = BytesIO(spotify_info.image_handler.right_image.getvalue())
-                return send_file(img_copy, mimetype="image/jpeg")
-        return "Image not found", 404
-    except IOError as e:
-        logger.error(f"Error serving right image: {str(e)}")
-        return str(e), 500
-
-
-@app.route("/all", methods=["GET"])
-def serve_all():
-    """Serve the complete image."""
-    try:
-        with spotify_info.image_handler.image_lock:
-            if spotify_info.image_handler.full_image:
-                img_copy = BytesIO(spotify_info.image_handler.full_image.getvalue())
-                return send_file(img_copy, mimetype="image/jpeg")
-        return "Image not found", 404
-    except IOError as e:
-        logger.error(f"Error serving full image: {str(e)}")
-        return str(e), 500
+def _image_response(image, etag):
+    """Serve a JPEG image, or 304 Not Modified if the client already has it."""
+    # A bytes body gets its Content-Length up front and goes out in one write
+    response = Response(image, mimetype="image/jpeg", direct_passthrough=True)
+    response.set_etag(etag)
+    return response.make_conditional(request)
+
+
+@app.route("/left", defaults={"part": "left"}, methods=["GET"])
+@app.route("/right", defaults={"part": "right"}, methods=["GET"])
+@app.route("/all", defaults={"part": "full"}, methods=["GET"])
+def serve_touchbar(part):
+    """Serve the left, right or complete image for Stream Deck display."""
+    snapshot = spotify_info.image_handler.snapshot
+    if snapshot:
+        return _image_response(getattr(snapshot, part), snapshot.etag)
+    return "Image not found", 404
 
 
 @app.route("/single", methods=["GET"])
 def serve_single():
     """Serve the single dial image."""
     # logger.debug("Request for single dial image received")
-    try:
-        with spotify_info.image_handler.image_lock:
-            if spotify_info.single_dial.single_image:
-                img_copy = BytesIO(spotify_info.single_dial.single_image.getvalue())
-                return send_file(img_copy, mimetype="image/jpeg")
-        return "Image not found", 404
-    except IOError as e:
-        logger.error(f"Error serving single dial image: {str(e)}")
-        return str(e), 500
+    snapshot = spotify_info.single_dial.snapshot
+    if snapshot:
+        return _image_response(*snapshot)
+    return "Image not found", 404
+
+
+def _next_main_loop_delay(last_api_call, refresh_rate):
+    """Seconds until the main loop has work: next poll, progress tick or track end."""
+    now = time.time()
+    delay = max(last_api_call + refresh_rate, spotify_info.rate_limited_until) - now
+    handler = spotify_info.image_handler
+    if (
+        spotify_info.track.is_playing
+        and handler.current_track_start_time
+        and handler.current_track_duration
+    ):
+        # The progress bar moves every second and the next track needs a poll
+        track_end = handler.current_track_start_time + handler.current_track_duration
+        delay = min(delay, track_end - now)
+    # Never spin, and never sleep longer than the old fixed one second tick
+    return min(max(delay, 0.1), 1)
 
 
 def check_port_available(port):
     """Check if a port is available for use."""
     try:
         with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            # Match Waitress, which binds with SO_REUSEADDR, so sockets left in
+            # TIME_WAIT by a previous run don't fail the check. On Windows the
+            # option would let us bind over a live server, so skip it there.
+            if platform.system() != "Windows":
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             sock.bind(('127.0.0.1', port))
         return True
     except socket.error:
@@ -835,16 +1049,36 @@ def check_port_available(port):
 
 
 def run_flask():
-    """Run the Flask server."""
-    app.run(host="127.0.0.1", port=PORT, debug=False)
+    """Run the Flask app on Waitress, or the Flask dev server with --dev."""
+    if "--dev" in sys.argv:
+        app.run(host="127.0.0.1", port=PORT, debug=False, threaded=True)
+    else:
+        # Waitress keeps HTTP/1.1 connections alive and sets TCP_NODELAY on
+        # accepted sockets by default, so polls reuse one loopback connection
+        serve(app, host="127.0.0.1", port=PORT, threads=SERVER_THREADS)
 
 
-def _refresh_track_info():
-    """Refresh track information and update display."""
+def _refresh_track_info(expected=None):
+    """Refresh track information and update display.
+
+    ``expected`` maps playback fields to the values the action just set; the
+    playback state is polled briefly until Spotify reports them.
+    """
     logger.debug("Starting track info refresh")
-    # Small delay to let Spotify update the state
-    time.sleep(0.1)
-    logger.debug("Post-action delay completed")
+    if expected:
+        # Short poll instead of a fixed delay, Spotify usually catches up fast
+        for _ in range(5):
+            spotify_info.playback.invalidate()
+            try:
+                playback = spotify_info.playback.get()
+            except (spotipy.SpotifyException, requests.RequestException):
+                break
+            if playback and all(
+                playback.get(key) == value for key, value in expected.items()
+            ):
+                break
+            time.sleep(0.02)
+        logger.debug("Post-action state poll completed")
 
     # Update track information
     logger.debug("Getting track info for refresh")
@@ -853,19 +1087,8 @@ def _refresh_track_info():
     if "error" not in track_info and "no_track" not in track_info:
         spotify_info.track.last_info = track_info
 
-        # Update shuffle state from current playback
-        try:
-            current_playback = spotify_info.sp.current_playback()
-            if current_playback:
-                spotify_info.track.shuffle_state = current_playback.get(
-                    "shuffle_state", False
-                )
-        except:
-            pass  # Keep existing shuffle state if update fails
-
         logger.debug("Creating status images after refresh")
-        spotify_info.create_status_images(track_info)
-        spotify_info.single_dial.create_single_dial_image(track_info)
+        spotify_info.render_track_images(track_info)
         logger.debug("Images created successfully after refresh")
         return True
     elif "no_track" in track_info:
@@ -880,9 +1103,15 @@ def _refresh_track_info():
 
 def _check_premium():
     """Check if the user has a Spotify Premium account."""
+    global _premium_checked_at, _is_premium
+    # The account tier practically never changes, don't ask on every press
+    if time.time() - _premium_checked_at < PREMIUM_CHECK_TTL:
+        return _is_premium
     try:
         user = spotify_info.sp.current_user()
-        return user["product"] == "premium"
+        _is_premium = user["product"] == "premium"
+        _premium_checked_at = time.time()
+        return _is_premium
     except:
         return False
 
@@ -897,7 +1126,7 @@ def _handle_seek(seconds, ticks=1):
         if (
             now - spotify_info.seek.last_seek_time > spotify_info.seek.refresh_delay
         ):
-            current_playback = spotify_info.sp.current_playback()
+            current_playback = spotify_info.playback.get()
             if not current_playback or not current_playback.get("is_playing"):
                 return {"status": "error", "message": "No active playback"}, 400
             spotify_info.seek.current_position_ms = current_playback.get("progress_ms", 0)
@@ -905,7 +1134,7 @@ def _handle_seek(seconds, ticks=1):
             spotify_info.seek.pending_seek_ms = 0  # Reset pending seeks after refresh
         # Initialize position if not set
         elif spotify_info.seek.current_position_ms is None:
-            current_playback = spotify_info.sp.current_playback()
+            current_playback = spotify_info.playback.get()
             if not current_playback or not current_playback.get("is_playing"):
                 return {"status": "error", "message": "No active playback"}, 400
             spotify_info.seek.current_position_ms = current_playback.get("progress_ms", 0)
@@ -953,6 +1182,135 @@ def _handle_seek(seconds, ticks=1):
         return {"status": "error", "message": str(e)}, 500
 
 
+def _schedule_volume_flush(volume):
+    """Coalesce rapid volume changes into one API call once rotation stops."""
+    with spotify_info.volume.lock:
+        spotify_info.volume.pending = volume
+        if spotify_info.volume.flush_timer is not None:
+            spotify_info.volume.flush_timer.cancel()
+        timer = threading.Timer(spotify_info.volume.update_delay, _flush_volume)
+        timer.daemon = True
+        spotify_info.volume.flush_timer = timer
+        timer.start()
+
+
+def _cancel_volume_flush():
+    """Drop a scheduled volume change; returns the volume it would have sent."""
+    with spotify_info.volume.lock:
+        volume = spotify_info.volume.pending
+        spotify_info.volume.pending = None
+        if spotify_info.volume.flush_timer is not None:
+            spotify_info.volume.flush_timer.cancel()
+            spotify_info.volume.flush_timer = None
+    return volume
+
+
+def _flush_volume():
+    """Send the last scheduled volume to Spotify."""
+    with spotify_info.volume.lock:
+        volume = spotify_info.volume.pending
+        spotify_info.volume.pending = None
+        spotify_info.volume.flush_timer = None
+    # A timer that fired just as mute or set cancelled it finds nothing to send
+    if volume is None:
+        return
+
+    try:
+        logger.debug(f"Setting volume to {volume}%")
+        spotify_info.sp.volume(volume)
+        spotify_info.playback.invalidate()
+    except (spotipy.SpotifyException, requests.RequestException) as e:
+        logger.error(f"Error setting volume: {str(e)}")
+
+
+def _start_playback_with_device_fallback(this_device_id=None):
+    """Start playback, activating a device if none is active; returns the message."""
+    try:
+        if this_device_id:
+            logger.debug(f"Starting playback on device: {this_device_id}")
+            spotify_info.sp.start_playback(device_id=this_device_id)
+            logger.debug("Start playback API call completed")
+            return "Started playback on specified device"
+        logger.debug("Starting playback (no specific device)")
+        spotify_info.sp.start_playback()
+        logger.debug("Start playback API call completed")
+        return "Started playback"
+    except spotipy.SpotifyException as e:
+        logger.debug(f"Start playback failed: {str(e)}")
+        # Check if it's a "no active device" error
+        if not (e.http_status == 404 and "No active device found" in str(e)):
+            if not this_device_id:
+                raise
+            # The configured device failed otherwise, let Spotify pick one
+            spotify_info.sp.start_playback()
+            logger.debug("Default start playback API call completed")
+            return "Started playback"
+
+        logger.debug("No active device error detected, trying to activate a device")
+        device_id = spotify_info._try_activate_device()
+        if not device_id:
+            logger.warning("No devices available to activate")
+            raise
+        try:
+            spotify_info.sp.start_playback(device_id=device_id)
+        except spotipy.SpotifyException:
+            if not this_device_id:
+                raise
+            # If still fails, try without device_id
+            spotify_info.sp.start_playback()
+            return "Started playback"
+        return "Started playback on activated device"
+
+
+def _schedule_render(*renders):
+    """Queue renders for the render worker, replacing a job that hasn't started."""
+    global _render_job
+    with _render_lock:
+        pending = _render_job is not None
+        _render_job = renders
+    if not pending:
+        _render_executor.submit(_run_render)
+
+
+def _run_render():
+    """Run the newest queued render job on the render worker."""
+    global _render_job
+    with _render_lock:
+        renders, _render_job = _render_job, None
+
+    try:
+        for render in renders:
+            render()
+    except Exception as e:
+        logger.error(f"Error rendering images: {str(e)}")
+
+
+def _schedule_refresh(after_skip=False, prev_track_id=None, expected=None):
+    """Queue a post-action refresh, dropping it if a plain one is already queued."""
+    global _refresh_pending
+    with _refresh_lock:
+        if _refresh_pending and not after_skip:
+            return
+        _refresh_pending = True
+    _refresh_executor.submit(_run_refresh, after_skip, prev_track_id, expected)
+
+
+def _run_refresh(after_skip, prev_track_id, expected):
+    """Refresh track info and images on the refresh worker."""
+    global _refresh_pending
+    with _refresh_lock:
+        # Actions arriving from now on need a fetch that starts after them
+        _refresh_pending = False
+
+    try:
+        if after_skip:
+            _refresh_images_immediately_after_skip(prev_track_id)
+        elif not _refresh_track_info(expected):
+            logger.warning("Failed to refresh track info after player action")
+    except Exception as e:
+        logger.error(f"Error refreshing track info after player action: {str(e)}")
+
+
 def _refresh_images_immediately_after_skip(prev_track_id: str | None, timeout: float = 2.5, interval: float = 0.2) -> bool:
     """
     Nach Next/Previous sofort die neue Track-ID abwarten und Bilder rendern.
@@ -966,6 +1324,7 @@ def _refresh_images_immediately_after_skip(prev_track_id: str | None, timeout: f
         new_info = None
 
         while time.time() < end:
+            spotify_info.playback.invalidate()
             info = spotify_info.get_current_track_info()
             # Success: new track with new ID
             if info and "track_id" in info and (prev_track_id is None or info["track_id"] != prev_track_id):
@@ -976,14 +1335,12 @@ def _refresh_images_immediately_after_skip(prev_track_id: str | None, timeout: f
         if new_info:
             # Update track information and images immediately
             spotify_info.track.last_info = new_info
-            spotify_info.create_status_images(new_info)
-            spotify_info.single_dial.create_single_dial_image(new_info)
+            spotify_info.render_track_images(new_info)
             return True
 
         # Fallback: Use last track information
         if spotify_info.track.last_info:
-            spotify_info.create_status_images(spotify_info.track.last_info)
-            spotify_info.single_dial.create_single_dial_image(spotify_info.track.last_info)
+            spotify_info.render_track_images(spotify_info.track.last_info)
 
         return False
 
@@ -1004,83 +1361,65 @@ def handle_player_action():
 
         action = data["action"]
         value = data.get("value")
+        # Set when the action already queued its own post-action refresh
+        refresh_scheduled = False
+        # Playback fields the action changed, used to poll for the new state
+        expected = None
 
         if action == "next":
             logger.debug("Executing next track action")
             prev_id = getattr(spotify_info.track, "current_id", None)
             spotify_info.sp.next_track()
             logger.debug("Next track API call completed")
-            _refresh_images_immediately_after_skip(prev_id)
+            _schedule_refresh(after_skip=True, prev_track_id=prev_id)
+            refresh_scheduled = True
             message = "Skipped to next track"
         elif action == "previous":
             logger.debug("Executing previous track action")
             prev_id = getattr(spotify_info.track, "current_id", None)
             spotify_info.sp.previous_track()
             logger.debug("Previous track API call completed")
-            _refresh_images_immediately_after_skip(prev_id)
+            _schedule_refresh(after_skip=True, prev_track_id=prev_id)
+            refresh_scheduled = True
             message = "Returned to previous track"
         elif action == "playpause":
             logger.debug("Executing play/pause action")
-            current_playback = spotify_info.sp.current_playback()
-            logger.debug("Got current playback for play/pause")
-            current_playing_state = current_playback and current_playback.get(
-                "is_playing"
-            )
-
-            if current_playing_state:
+            paused = False
+            if spotify_info.track.is_playing:
+                # The deck shows playback as running, so pause right away
+                # instead of checking first; Spotify refuses the pause (403, or
+                # 404 without an active device) if it already stopped elsewhere
                 logger.debug("Pausing playback")
-                spotify_info.sp.pause_playback()
-                logger.debug("Pause API call completed")
+                try:
+                    spotify_info.sp.pause_playback()
+                    paused = True
+                    logger.debug("Pause API call completed")
+                except spotipy.SpotifyException as e:
+                    if e.http_status not in (403, 404):
+                        raise
+                    logger.debug(f"Pause refused, starting playback instead: {str(e)}")
+            else:
+                # Starting may transfer playback to SPOTIFY_THIS_DEVICE, so only
+                # do it once the playback state confirms nothing is playing
+                current_playback = spotify_info.playback.get()
+                logger.debug("Got current playback for play/pause")
+                if current_playback and current_playback.get("is_playing"):
+                    logger.debug("Pausing playback")
+                    spotify_info.sp.pause_playback()
+                    logger.debug("Pause API call completed")
+                    paused = True
+
+            if paused:
+                spotify_info.track.is_playing = False
+                expected = {"is_playing": False}
                 message = "Paused playback"
             else:
                 # Use specific device if not playing
-                this_device_id = os.getenv("SPOTIFY_THIS_DEVICE")
-                if this_device_id:
-                    try:
-                        logger.debug(f"Starting playback on device: {this_device_id}")
-                        spotify_info.sp.start_playback(device_id=this_device_id)
-                        logger.debug("Start playback API call completed")
-                        message = "Started playback on specified device"
-                    except spotipy.SpotifyException as e:
-                        logger.debug(f"Device-specific playback failed: {str(e)}")
-                        # Check if it's a "no active device" error
-                        if hasattr(e, 'http_status') and e.http_status == 404 and "No active device found" in str(e):
-                            logger.debug("No active device error detected, trying to activate a device")
-                            device_id = spotify_info._try_activate_device()
-                            if device_id:
-                                try:
-                                    spotify_info.sp.start_playback(device_id=device_id)
-                                    message = "Started playback on activated device"
-                                except spotipy.SpotifyException:
-                                    # If still fails, try without device_id
-                                    spotify_info.sp.start_playback()
-                                    message = "Started playback"
-                            else:
-                                logger.warning("No devices available to activate")
-                                raise e
-                        else:
-                            spotify_info.sp.start_playback()
-                            logger.debug("Default start playback API call completed")
-                            message = "Started playback"
-                else:
-                    try:
-                        logger.debug("Starting playback (no specific device)")
-                        spotify_info.sp.start_playback()
-                        logger.debug("Start playback API call completed")
-                        message = "Started playback"
-                    except spotipy.SpotifyException as e:
-                        # Check if it's a "no active device" error
-                        if hasattr(e, 'http_status') and e.http_status == 404 and "No active device found" in str(e):
-                            logger.debug("No active device error detected, trying to activate a device")
-                            device_id = spotify_info._try_activate_device()
-                            if device_id:
-                                spotify_info.sp.start_playback(device_id=device_id)
-                                message = "Started playback on activated device"
-                            else:
-                                logger.warning("No devices available to activate")
-                                raise e
-                        else:
-                            raise e
+                message = _start_playback_with_device_fallback(
+                    os.getenv("SPOTIFY_THIS_DEVICE")
+                )
+                spotify_info.track.is_playing = True
+                expected = {"is_playing": True}
         elif action == "togglelike":
             response = spotify_info._handle_like_toggle()
             return jsonify(response[0]), response[1]
@@ -1097,7 +1436,7 @@ def handle_player_action():
 
             try:
                 logger.debug("Getting current playback for shuffle toggle")
-                current_playback = spotify_info.sp.current_playback()
+                current_playback = spotify_info.playback.get()
                 if not current_playback:
                     return jsonify(
                         {"status": "error", "message": "No active playback"}
@@ -1107,6 +1446,8 @@ def handle_player_action():
                 logger.debug(f"Toggling shuffle from {current_shuffle} to {not current_shuffle}")
                 spotify_info.sp.shuffle(not current_shuffle)
                 logger.debug("Shuffle toggle API call completed")
+                spotify_info.track.shuffle_state = not current_shuffle
+                expected = {"shuffle_state": not current_shuffle}
                 message = "Shuffle " + ("disabled" if current_shuffle else "enabled")
             except spotipy.SpotifyException as e:
                 if e.http_status == 403:
@@ -1128,7 +1469,7 @@ def handle_player_action():
                     > spotify_info.volume.refresh_delay
                 ):
                     logger.debug("Refreshing volume from API for volume up")
-                    current_playback = spotify_info.sp.current_playback()
+                    current_playback = spotify_info.playback.get()
                     logger.debug("Volume up refresh API call completed")
                     if not current_playback:
                         return jsonify(
@@ -1139,7 +1480,7 @@ def handle_player_action():
                     ]
                 # Initialize current_volume if not set
                 elif spotify_info.volume.current is None:
-                    current_playback = spotify_info.sp.current_playback()
+                    current_playback = spotify_info.playback.get()
                     if not current_playback:
                         return jsonify(
                             {"status": "error", "message": "No active playback"}
@@ -1157,15 +1498,9 @@ def handle_player_action():
                 if new_volume > 0:
                     spotify_info.volume.last_unmuted_volume = new_volume
 
-                # Only make API call if enough time has passed
-                if (
-                    now - spotify_info.volume.last_update
-                    >= spotify_info.volume.update_delay
-                ):
-                    logger.debug(f"Setting volume up to {new_volume}%")
-                    spotify_info.sp.volume(new_volume)
-                    logger.debug("Volume up API call completed")
-                    spotify_info.volume.last_update = now
+                # Send only the final volume once the dial stops turning
+                logger.debug(f"Scheduling volume up to {new_volume}%")
+                _schedule_volume_flush(new_volume)
 
                 message = f"Volume increased to {new_volume}%"
 
@@ -1184,7 +1519,7 @@ def handle_player_action():
                     > spotify_info.volume.refresh_delay
                 ):
                     logger.debug("Refreshing volume from API for volume down")
-                    current_playback = spotify_info.sp.current_playback()
+                    current_playback = spotify_info.playback.get()
                     logger.debug("Volume down refresh API call completed")
                     if not current_playback:
                         return jsonify(
@@ -1195,7 +1530,7 @@ def handle_player_action():
                     ]
                 # Initialize current_volume if not set
                 elif spotify_info.volume.current is None:
-                    current_playback = spotify_info.sp.current_playback()
+                    current_playback = spotify_info.playback.get()
                     if not current_playback:
                         return jsonify(
                             {"status": "error", "message": "No active playback"}
@@ -1213,15 +1548,9 @@ def handle_player_action():
                 if new_volume > 0:
                     spotify_info.volume.last_unmuted_volume = new_volume
 
-                # Only make API call if enough time has passed
-                if (
-                    now - spotify_info.volume.last_update
-                    >= spotify_info.volume.update_delay
-                ):
-                    logger.debug(f"Setting volume down to {new_volume}%")
-                    spotify_info.sp.volume(new_volume)
-                    logger.debug("Volume down API call completed")
-                    spotify_info.volume.last_update = now
+                # Send only the final volume once the dial stops turning
+                logger.debug(f"Scheduling volume down to {new_volume}%")
+                _schedule_volume_flush(new_volume)
 
                 message = f"Volume decreased to {new_volume}%"
 
@@ -1230,14 +1559,19 @@ def handle_player_action():
                 return jsonify({"status": "error", "message": str(e)}), 500
         elif action == "volumemute":
             logger.debug("Processing volume mute action")
-            current_playback = spotify_info.sp.current_playback()
+            current_playback = spotify_info.playback.get()
             logger.debug("Got current playback for mute action")
             if not current_playback:
                 return jsonify(
                     {"status": "error", "message": "No active playback"}
                 ), 400
 
-            current_volume = current_playback["device"]["volume_percent"]
+            # A debounced rotation would otherwise land after, and undo, the mute
+            pending_volume = _cancel_volume_flush()
+            if pending_volume is not None:
+                current_volume = pending_volume
+            else:
+                current_volume = current_playback["device"]["volume_percent"]
 
             if current_volume > 0:
                 # Si le volume n'est pas à 0, on sauvegarde le volume actuel et on mute
@@ -1245,6 +1579,7 @@ def handle_player_action():
                 spotify_info.volume.last_unmuted_volume = current_volume
                 spotify_info.sp.volume(0)
                 logger.debug("Mute API call completed")
+                spotify_info.volume.current = 0
                 message = "Volume muted"
             else:
                 # Si le volume est à 0, on restore le dernier volume
@@ -1252,6 +1587,7 @@ def handle_player_action():
                 logger.debug(f"Unmuting to volume {restore_volume}%")
                 spotify_info.sp.volume(restore_volume)
                 logger.debug("Unmute API call completed")
+                spotify_info.volume.current = restore_volume
                 message = f"Volume restored to {restore_volume}%"
         elif action == "volumeset":
             logger.debug(f"Processing volume set action to {value}%")
@@ -1261,9 +1597,12 @@ def handle_player_action():
                 ), 400
 
             volume = max(0, min(100, value))
+            # The explicit value wins over a debounced rotation still waiting
+            _cancel_volume_flush()
             logger.debug(f"Setting volume to {volume}%")
             spotify_info.sp.volume(volume)
             logger.debug("Volume set API call completed")
+            spotify_info.volume.current = volume
             if volume > 0:
                 spotify_info.volume.last_unmuted_volume = volume
             message = f"Volume set to {volume}%"
@@ -1294,13 +1633,13 @@ def handle_player_action():
         else:
             return jsonify({"status": "error", "message": "Invalid action"}), 400
 
-        # Refresh track information after any action
-        logger.debug("Refreshing track info after player action")
-        if not _refresh_track_info():
-            logger.warning("Failed to refresh track info after player action")
-            return jsonify(
-                {"status": "error", "message": "Failed to refresh track info"}
-            ), 500
+        if not refresh_scheduled:
+            # The action changed playback, cached state is stale now
+            spotify_info.playback.invalidate()
+
+            # Refresh track information after any action, off the request thread
+            logger.debug("Scheduling track info refresh after player action")
+            _schedule_refresh(expected=expected)
 
         return jsonify({"status": "success", "message": message}), 200
 
@@ -1312,39 +1651,56 @@ def handle_player_action():
         return jsonify({"status": "error", "message": str(e)}), 500
 
 
+@lru_cache(maxsize=32)
+def _serialize_button_states(is_playing, is_liked, is_shuffle, is_muted):
+    """Serialize a button state combination once, returning (body, etag)."""
+    body = json.dumps(
+        {
+            "success": True,
+            "states": {
+                "is_playing": is_playing,
+                "is_liked": is_liked,
+                "is_shuffle": is_shuffle,
+                "is_muted": is_muted,
+            },
+        },
+        separators=(",", ":"),
+    ).encode()
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
 # Add new routes for button states
 @app.route("/states", methods=["GET"])
 def get_button_states():
     """Get current states of all buttons."""
     try:
-        # Use cached states instead of making API calls
-        button_states = {
-            "is_playing": spotify_info.track.is_playing,
-            "is_liked": spotify_info.track.current_liked,
-            "is_shuffle": spotify_info.track.shuffle_state,  # Use cached shuffle state
-            "is_muted": spotify_info.volume.current == 0
+        # Use cached states instead of making API calls; the handful of
+        # possible combinations are serialized once and reused across polls
+        body, etag = _serialize_button_states(
+            spotify_info.track.is_playing,
+            spotify_info.track.current_liked,
+            spotify_info.track.shuffle_state,  # Use cached shuffle state
+            spotify_info.volume.current == 0
             if spotify_info.volume.current is not None
             else False,
-        }
+        )
 
-        return jsonify({"success": True, "states": button_states})
+        response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
-@app.route("/devices", methods=["GET"])
-def get_devices():
-    """Get list of available Spotify devices."""
-    try:
-        devices_data = spotify_info.sp.devices()
-        
-        if not devices_data or not devices_data.get("devices"):
-            return jsonify({
-                "success": True, 
-                "devices": [],
-                "message": "No devices found"
-            })
-        
+def _serialize_devices(devices_data):
+    """Build the /devices JSON body, returning (body, etag)."""
+    if not devices_data or not devices_data.get("devices"):
+        payload = {
+            "success": True, 
+            "devices": [],
+            "message": "No devices found"
+        }
+    else:
         # Format device information for JSON response
         formatted_devices = []
         for device in devices_data["devices"]:
@@ -1365,12 +1721,34 @@ def get_devices():
             None
         )
         
-        return jsonify({
+        payload = {
             "success": True,
             "devices": formatted_devices,
             "active_device": active_device,
             "total_devices": len(formatted_devices)
-        })
+        }
+
+    body = json.dumps(payload, separators=(",", ":")).encode()
+    return body, hashlib.blake2b(body, digest_size=8).hexdigest()
+
+
+@app.route("/devices", methods=["GET"])
+def get_devices():
+    """Get list of available Spotify devices."""
+    global _devices_response, _devices_fetched_at
+    try:
+        # The property inspector asks again each time it opens; one devices()
+        # call serves them all for DEVICES_CACHE_TTL
+        with _devices_lock:
+            now = time.time()
+            if _devices_response is None or now - _devices_fetched_at >= DEVICES_CACHE_TTL:
+                _devices_response = _serialize_devices(spotify_info.sp.devices())
+                _devices_fetched_at = now
+            body, etag = _devices_response
+
+        response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        return response.make_conditional(request)
         
     except spotipy.SpotifyException as e:
         return jsonify({
@@ -1387,8 +1765,12 @@ def get_devices():
 
 
 if __name__ == "__main__":
-# debugpy.listen(5678)
-    # logger.info(f"PID: {os.getpid()}")
+    # Only load the debugger when asked to (see "Python: Remote Attach")
+    if os.getenv("DEBUGPY_ENABLE"):
+        import debugpy
+
+        debugpy.listen(5678)
+        logger.info(f"debugpy listening on port 5678, PID: {os.getpid()}")
 
     # Check if port is available before starting
     if not check_port_available(PORT):
@@ -1404,6 +1786,7 @@ if __name__ == "__main__":
     IS_FIRST_RUN = True
     LAST_API_CALL = 0
     CURRENT_REFRESH_RATE = REFRESH_RATE_PLAYING
+    IDLE_SINCE = None
     NEEDS_LOGIN = True
     HAS_CREDENTIALS_ERROR = False
 
@@ -1415,31 +1798,32 @@ if __name__ == "__main__":
 
     while True:
         current_time = time.time()
-        logger.debug(f"Main loop iteration started at {current_time}")
+        logger.debug("Main loop iteration started at %s", current_time)
 
         try:
             logger.debug("Entering try block")
             # Only try authentication if we don't have a credentials error
             if NEEDS_LOGIN and not HAS_CREDENTIALS_ERROR:
                 logger.debug("Attempting Spotify authentication")
-                spotify_info.sp.current_playback()
+                spotify_info.playback.get()
                 logger.debug("Authentication API call completed")
                 NEEDS_LOGIN = False
                 logger.info("Successfully authenticated with Spotify")
             else:
-                logger.debug(f"Skipping auth - NEEDS_LOGIN: {NEEDS_LOGIN}, HAS_CREDENTIALS_ERROR: {HAS_CREDENTIALS_ERROR}")
+                logger.debug("Skipping auth - NEEDS_LOGIN: %s, HAS_CREDENTIALS_ERROR: %s", NEEDS_LOGIN, HAS_CREDENTIALS_ERROR)
 
             # Only proceed with normal operation if logged in
             if not NEEDS_LOGIN and not HAS_CREDENTIALS_ERROR:
                 logger.debug("Entering normal operation block")
-                logger.debug(f"Time check: current={current_time:.2f}, last_api={LAST_API_CALL:.2f}, diff={current_time - LAST_API_CALL:.2f}, refresh_rate={CURRENT_REFRESH_RATE}")
+                logger.debug("Time check: current=%.2f, last_api=%.2f, diff=%.2f, refresh_rate=%s", current_time, LAST_API_CALL, current_time - LAST_API_CALL, CURRENT_REFRESH_RATE)
                 
                 # Debug track end detection
                 if (
                     spotify_info.track.is_playing
                     and spotify_info.image_handler.current_track_start_time
+                    and logger.isEnabledFor(logging.DEBUG)
                 ):
-                    logger.debug(f"Track end check: start_time={spotify_info.image_handler.current_track_start_time}, duration={spotify_info.image_handler.current_track_duration}, elapsed={current_time - spotify_info.image_handler.current_track_start_time:.2f}")
+                    logger.debug("Track end check: start_time=%s, duration=%s, elapsed=%.2f", spotify_info.image_handler.current_track_start_time, spotify_info.image_handler.current_track_duration, current_time - spotify_info.image_handler.current_track_start_time)
                 
                 # Only check for track end if we have valid timing information
                 if (
@@ -1457,12 +1841,16 @@ if __name__ == "__main__":
                         LAST_API_CALL = current_time
                         if "error" not in track_info:
                             spotify_info.track.last_info = track_info
-                            spotify_info.create_status_images(track_info)
+                            _schedule_render(partial(spotify_info.render_track_images, track_info))
                         continue
 
+                progress_ratio = spotify_info.image_handler.estimated_progress(current_time)
+
                 # Only make API call if refresh delay has elapsed
-                if current_time - LAST_API_CALL >= CURRENT_REFRESH_RATE or IS_FIRST_RUN:
-                    logger.debug(f"Making API call - time since last: {current_time - LAST_API_CALL:.2f}s")
+                if current_time < spotify_info.rate_limited_until:
+                    logger.debug("Rate limited, skipping API call")
+                elif current_time - LAST_API_CALL >= CURRENT_REFRESH_RATE or IS_FIRST_RUN:
+                    logger.debug("Making API call - time since last: %.2fs", current_time - LAST_API_CALL)
                     logger.debug("About to call get_current_track_info()")
                     current_track_info = spotify_info.get_current_track_info()
                     logger.debug("Main loop API call completed")
@@ -1471,65 +1859,64 @@ if __name__ == "__main__":
                     if "no_track" in current_track_info:
                         # No track currently playing - show pause layout
                         logger.debug("No track detected, creating no-track layout")
-                        spotify_info.create_no_track_image()
-                        spotify_info.single_dial.create_single_dial_no_track_image()
+                        _schedule_render(
+                            spotify_info.create_no_track_image,
+                            spotify_info.single_dial.create_single_dial_no_track_image,
+                        )
                         CURRENT_REFRESH_RATE = REFRESH_RATE_PAUSED
                     elif "auth_error" in current_track_info:
                         # Authentication error - show login message
                         logger.error(f"\nAuthentication error: {current_track_info['auth_error']}")
-                        spotify_info.image_handler.create_login_message_image()
-                        spotify_info.single_dial.create_single_dial_login_image()
+                        _schedule_render(
+                            spotify_info.image_handler.create_login_message_image,
+                            spotify_info.single_dial.create_single_dial_login_image,
+                        )
                         NEEDS_LOGIN = True
                         CURRENT_REFRESH_RATE = REFRESH_RATE_PAUSED
                     elif "error" in current_track_info:
                         # Other errors - show error message
                         logger.error(f"\nError: {current_track_info['error']}")
-                        spotify_info.image_handler.create_error_message_image(current_track_info['error'])
-                        spotify_info.single_dial.create_single_dial_error_image(current_track_info['error'])
+                        _schedule_render(
+                            partial(spotify_info.image_handler.create_error_message_image, current_track_info['error']),
+                            partial(spotify_info.single_dial.create_single_dial_error_image, current_track_info['error']),
+                        )
                         CURRENT_REFRESH_RATE = REFRESH_RATE_PAUSED
                     else:
                         # Normal track playing - show full layout
                         logger.debug("Normal track detected, creating full layout")
                         spotify_info.track.last_info = current_track_info
-                        spotify_info.create_status_images(current_track_info)
-                        spotify_info.single_dial.create_single_dial_image(current_track_info)
+                        _schedule_render(partial(spotify_info.render_track_images, current_track_info))
                         CURRENT_REFRESH_RATE = (
                             REFRESH_RATE_PLAYING
                             if spotify_info.track.is_playing
                             else REFRESH_RATE_PAUSED
                         )
 
+                    # Back off while the deck sits idle; /player actions still
+                    # refresh right away through the refresh worker
+                    if spotify_info.track.is_playing:
+                        IDLE_SINCE = None
+                    elif IDLE_SINCE is None:
+                        IDLE_SINCE = current_time
+                    elif current_time - IDLE_SINCE >= IDLE_AFTER:
+                        CURRENT_REFRESH_RATE = REFRESH_RATE_IDLE
+
                 # Update progress bar only if playback is active and no API call was made this iteration
                 elif (
                     spotify_info.track.is_playing
-                    and spotify_info.image_handler.current_track_start_time
-                    and spotify_info.image_handler.current_track_duration
+                    and progress_ratio is not None
                     and spotify_info.track.last_info
                 ):
-                    elapsed_time = (
-                        current_time
-                        - spotify_info.image_handler.current_track_start_time
-                    )
-                    progress_ratio = min(
-                        elapsed_time
-                        / spotify_info.image_handler.current_track_duration,
-                        1.0,
-                    )
-                    logger.debug(f"Updating progress bar, ratio: {progress_ratio:.3f}")
-                    spotify_info.create_status_images(
-                        spotify_info.track.last_info, override_progress=progress_ratio
-                    )
-                    spotify_info.single_dial.create_single_dial_image(
-                        spotify_info.track.last_info, override_progress=progress_ratio
+                    logger.debug("Updating progress bar, ratio: %.3f", progress_ratio)
+                    _schedule_render(
+                        partial(
+                            spotify_info.render_track_images,
+                            spotify_info.track.last_info,
+                            override_progress=progress_ratio,
+                        )
                     )
-                else:
-                    logger.debug(f"No progress update: is_playing={spotify_info.track.is_playing}, has_start_time={spotify_info.image_handler.current_track_start_time is not None}, has_duration={spotify_info.image_handler.current_track_duration is not None}, has_last_info={spotify_info.track.last_info is not None}")
-
-                # Update button states at the refresh rate
-                if current_time - LAST_API_CALL >= CURRENT_REFRESH_RATE or IS_FIRST_RUN:
-                    logger.debug("Updating button states")
-                    spotify_info.update_button_states()
-                    logger.debug("Button states updated")
+                elif logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("No progress update: is_playing=%s, has_start_time=%s, has_duration=%s, has_last_info=%s", spotify_info.track.is_playing, spotify_info.image_handler.current_track_start_time is not None, spotify_info.image_handler.current_track_duration is not None, spotify_info.track.last_info is not None)
             else:
                 logger.debug("Skipping normal operation - not authenticated or has credentials error")
 
@@ -1545,30 +1932,24 @@ if __name__ == "__main__":
             error_desc = str(e)
             if "invalid_client" in error_desc:
                 logger.error("Error: Invalid Spotify credentials")
-                spotify_info.image_handler.create_error_message_image(
-                    "Invalid Spotify credentials"
-                )
-                spotify_info.single_dial.create_single_dial_error_image(
-                    "Invalid Spotify credentials"
+                _schedule_render(
+                    partial(spotify_info.image_handler.create_error_message_image, "Invalid Spotify credentials"),
+                    partial(spotify_info.single_dial.create_single_dial_error_image, "Invalid Spotify credentials"),
                 )
                 HAS_CREDENTIALS_ERROR = True
             else:
                 logger.error(f"Authentication error: {error_desc}")
-                spotify_info.image_handler.create_error_message_image(
-                    "Authentication error"
-                )
-                spotify_info.single_dial.create_single_dial_error_image(
-                    "Authentication error"
+                _schedule_render(
+                    partial(spotify_info.image_handler.create_error_message_image, "Authentication error"),
+                    partial(spotify_info.single_dial.create_single_dial_error_image, "Authentication error"),
                 )
                 HAS_CREDENTIALS_ERROR = True
 
         except spotipy.SpotifyException as e:
             logger.error(f"Spotify error: {str(e)}")
-            spotify_info.image_handler.create_error_message_image(
-                "Spotify error occurred"
-            )
-            spotify_info.single_dial.create_single_dial_error_image(
-                "Spotify error occurred"
+            _schedule_render(
+                partial(spotify_info.image_handler.create_error_message_image, "Spotify error occurred"),
+                partial(spotify_info.single_dial.create_single_dial_error_image, "Spotify error occurred"),
             )
             HAS_CREDENTIALS_ERROR = True
 
@@ -1577,5 +1958,9 @@ if __name__ == "__main__":
             logger.error(f"Exception type: {type(e).__name__}")
             logger.error(f"Traceback: {traceback.format_exc()}")
 
-        logger.debug("Main loop iteration completed, sleeping 1s")
-        time.sleep(1)  # Always wait 1 second between iterations
+        if NEEDS_LOGIN or HAS_CREDENTIALS_ERROR:
+            delay = 1
+        else:
+            delay = _next_main_loop_delay(LAST_API_CALL, CURRENT_REFRESH_RATE)
+        logger.debug("Main loop iteration completed, sleeping %.2fs", delay)
+        time.sleep(delay)
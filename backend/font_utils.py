@@ -3,6 +3,7 @@
 import os
 import platform
 import logging
+from functools import lru_cache
 from PIL import ImageFont
 
 logger = logging.getLogger(__name__)
@@ -10,52 +11,56 @@ logger = logging.getLogger(__name__)
 font_found = False
 last_font_path = None
 
+# Fonts to try in order of preference, per platform.system()
+_FONT_PATHS_BY_SYSTEM = {
+    "Windows": (
+        "C:/Windows/Fonts/yugothm.ttc",     # Yu Gothic Medium - supports Japanese
+        "C:/Windows/Fonts/NotoSans-Regular.ttf",  # Noto Sans if installed
+        "C:/Windows/Fonts/meiryo.ttc",      # Meiryo - supports Japanese
+        "C:/Windows/Fonts/msgothic.ttc",    # MS Gothic - supports Japanese
+        "C:/Windows/Fonts/arial.ttf",       # Fallback to arial
+    ),
+    "Darwin": (  # macOS
+        "/System/Library/Fonts/Hiragino Sans GB.ttc",
+        "/System/Library/Fonts/PingFang.ttc",
+        "/Library/Fonts/Arial Unicode MS.ttf",
+        "/System/Library/Fonts/Arial.ttf",
+    ),
+    "Linux": (
+        "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
+        "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "/usr/share/fonts/TTF/arial.ttf",
+    ),
+}
+# The platform can't change while running, resolve the list once at import
+_FONT_PATHS = _FONT_PATHS_BY_SYSTEM.get(platform.system(), ())
+
+
+@lru_cache(maxsize=32)
+def _load_font(font_path, size):
+    """Load a TrueType font once per path and size; the parsed face is reused."""
+    return ImageFont.truetype(font_path, size)
+
+
 def get_unicode_font(size):
     """Get a font that supports Unicode characters including Japanese, Chinese, etc."""
     global font_found, last_font_path
     if font_found:
         try:
-            return ImageFont.truetype(last_font_path, size)
-        except (OSError, IOError):
+            return _load_font(last_font_path, size)
+        except (OSError, IOError) as e:
             logger.error(f"Failed to load font {last_font_path}: {str(e)}")
             pass
             
-    system = platform.system()
-    
-    # List of fonts to try in order of preference
-    font_paths = []
-    
-    if system == "Windows":
-        font_paths = [
-            "C:/Windows/Fonts/yugothm.ttc",     # Yu Gothic Medium - supports Japanese
-            "C:/Windows/Fonts/NotoSans-Regular.ttf",  # Noto Sans if installed
-            "C:/Windows/Fonts/meiryo.ttc",      # Meiryo - supports Japanese  
-            "C:/Windows/Fonts/msgothic.ttc",    # MS Gothic - supports Japanese
-            "C:/Windows/Fonts/arial.ttf",       # Fallback to arial
-        ]
-    elif system == "Darwin":  # macOS
-        font_paths = [
-            "/System/Library/Fonts/Hiragino Sans GB.ttc",
-            "/System/Library/Fonts/PingFang.ttc", 
-            "/Library/Fonts/Arial Unicode MS.ttf",
-            "/System/Library/Fonts/Arial.ttf",
-        ]
-    elif system == "Linux":
-        font_paths = [
-            "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Regular.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
-            "/usr/share/fonts/TTF/arial.ttf",
-        ]
-    
     # Try each font path
-    for font_path in font_paths:
+    for font_path in _FONT_PATHS:
         try:
             if os.path.exists(font_path):
                 logger.debug(f"Loading font: {font_path}")
                 font_found = True   
                 last_font_path = font_path
-                return ImageFont.truetype(font_path, size)
+                return _load_font(font_path, size)
         except (OSError, IOError) as e:
             logger.error(f"Failed to load font {font_path}: {str(e)}")
             continue
@@ -67,10 +72,26 @@ def get_unicode_font(size):
             logger.debug(f"Trying font by name: {font_name}")
             font_found = True
             last_font_path = font_name
-            return ImageFont.truetype(font_name, size)
+            return _load_font(font_name, size)
         except (OSError, IOError):
             continue
     
     # Final fallback to PIL default font
     logger.warning("Using PIL default font - Unicode characters may not display correctly")
     return ImageFont.load_default()
+
+
+def truncate_text(text, font, max_width):
+    """Truncate text with an ellipsis so it fits within max_width."""
+    if font.getlength(text) <= max_width:
+        return text
+
+    # Binary search the longest prefix that still fits with the ellipsis
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if font.getlength(text[:mid] + "...") <= max_width:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low] + "..."
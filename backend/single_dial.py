@@ -1,15 +1,108 @@
 """Single dial image generation for Spotify integration with Stream Deck."""
 
+import hashlib
 import logging
 import time
 import os
-from io import BytesIO
+from collections import OrderedDict
+from functools import lru_cache
+from threading import Lock
 from PIL import Image, ImageDraw, ImageFont
 import requests
-from font_utils import get_unicode_font
+from font_utils import get_unicode_font, truncate_text
 
 logger = logging.getLogger(__name__)
 
+MESSAGE_IMAGE_CACHE_SIZE = 16  # encoded login/error/no-track images kept for reuse
+HEART_ICON_PATHS = {
+    True: os.path.join(os.path.dirname(__file__), "spotify-liked.png"),
+    False: os.path.join(os.path.dirname(__file__), "spotify-like.png"),
+}
+
+
+def get_progress(track_data, override_progress=None):
+    """Get playback progress as a ratio, from override_progress or the polled track info."""
+    if override_progress is not None:
+        return override_progress
+
+    # The poll behind track_data already recorded the track timing, so no
+    # second playback request is needed
+    duration_ms = track_data.get("duration_ms")
+    if duration_ms and "progress_ms" in track_data:
+        return track_data["progress_ms"] / duration_ms
+    return None
+
+
+def _create_pause_overlay_single():
+    """Draw the 200x100 RGBA single dial overlay with two centered pause bars."""
+    overlay = Image.new("RGBA", (200, 100), (0, 0, 0, 64))
+    draw_overlay = ImageDraw.Draw(overlay)
+
+    # Pause bars centered on the entire width
+    bar_width = 6
+    bar_height = 20
+    spacing = 6
+    start_x = (200 - (2 * bar_width + spacing)) // 2  # Center on full width (200px)
+    start_y = (100 - bar_height) // 2
+
+    for x in (start_x, start_x + bar_width + spacing):
+        draw_overlay.rectangle(
+            [x, start_y, x + bar_width, start_y + bar_height],
+            fill="white",
+        )
+
+    return overlay
+
+
+# The pause overlay never changes, so draw it once
+_PAUSE_OVERLAY_SINGLE = _create_pause_overlay_single()
+
+
+@lru_cache(maxsize=None)
+def _progress_bar_sprite(progress_width):
+    """Draw the progress bar (background and fill) once per fill width."""
+    # Drawn on black like the canvas underneath, so it can be pasted without a mask
+    sprite = Image.new("RGB", (max(165, progress_width or 0) + 1, 4), "black")
+    draw = ImageDraw.Draw(sprite)
+    draw.rounded_rectangle([0, 0, 165, 3], radius=1, fill="#404040")
+    if progress_width is not None:
+        draw.rounded_rectangle([0, 0, progress_width, 3], radius=1, fill="#1DB954")
+    return sprite
+
+
+@lru_cache(maxsize=32)
+def _wrap_track_name(track_name, font, max_width):
+    """Split a track name into at most two lines that fit within max_width."""
+    # Check if the text fits on one line
+    if font.getlength(track_name) <= max_width:
+        return (track_name,)
+    
+    # Split into words for wrapping
+    words = track_name.split()
+    lines = []
+    current_line = []
+    
+    for word in words:
+        current_line.append(word)
+        test_line = " ".join(current_line)
+        
+        if font.getlength(test_line) > max_width:
+            if len(current_line) > 1:
+                # Remove the word that made it too long
+                current_line.pop()
+                lines.append(" ".join(current_line))
+                current_line = [word]
+            else:
+                # Single word is too long, truncate it
+                lines.append(truncate_text(word, font, max_width))
+                current_line = []
+    
+    # Add remaining words
+    if current_line:
+        lines.append(" ".join(current_line))
+    
+    return tuple(lines[:2])
+
 
 class SingleDialImageHandler:
     """Handles single dial image generation for Stream Deck display."""
@@ -17,28 +110,56 @@ class SingleDialImageHandler:
     def __init__(self, spotify_client, image_handler):
         self.spotify_client = spotify_client
         self.image_handler = image_handler
-        self.single_image = None
+        # Published (JPEG bytes, ETag) pair, replaced as a whole so readers need no lock
+        self.snapshot = None
+        # Guards the message cache, which renders on different threads share
+        self.image_lock = Lock()
+        # Icons and placeholder never change, so load and size them once
+        self.heart_icons = {
+            is_liked: self._load_heart_icon_single(icon_path)
+            for is_liked, icon_path in HEART_ICON_PATHS.items()
+        }
+        self.cover_placeholder = Image.new("RGB", (50, 50), "#1a1a1a")
+        # (image_url, 50x50 cover) of the last track, resized once per track
+        self.cover_thumbnail = None
+        # Render key of the published track frame; stays None while that frame
+        # shows the cover placeholder, so the next render retries the cover
+        self._last_render_key = None
+        # Dial-sized login/error/no-track images, encoded once per message text
+        self.message_image_cache = OrderedDict()
 
     def create_single_dial_image(self, current_track_info, override_progress=None):
         """Create a single dial image with all track information."""
         try:
+            # Check if track changed and update liked status if needed
+            track_id = current_track_info["track_id"]
+            self.spotify_client.sync_liked_status(track_id)
+
+            # The dial's 165 px bar advances slower than the touchbar's, so most
+            # ticks map to the width already on screen and redraw nothing
+            current_progress = get_progress(current_track_info, override_progress)
+            progress_width = (
+                int(165 * current_progress) if current_progress is not None else None
+            )
+            render_key = (
+                track_id,
+                progress_width,
+                current_track_info.get("is_playing", True),
+                self.spotify_client.track.current_liked,
+            )
+            if render_key == self._last_render_key:
+                return True
+
             # Create rectangular image for single dial (200x100)
             background = Image.new("RGB", (200, 100), "black")
             draw = ImageDraw.Draw(background)
 
             # Add album cover (50x50 in top right)
-            self._add_single_album_cover(background, current_track_info)
+            has_cover = self._add_single_album_cover(background, current_track_info)
 
             # Add track info and progress
-            self._add_single_dial_track_info(draw, current_track_info, override_progress)
-
-            # Check if track changed and update liked status if needed
-            track_id = current_track_info["track_id"]
-            if track_id != self.spotify_client.track.current_id:
-                self.spotify_client.track.current_id = track_id
-                self.spotify_client.track.current_liked = self.spotify_client.sp.current_user_saved_tracks_contains(
-                    [track_id]
-                )[0]
+            self._add_single_dial_track_info(draw, current_track_info)
+            self._create_single_progress_bar(background, progress_width)
 
             # Add heart icon
             self._add_heart_icon_single(background, self.spotify_client.track.current_liked)
@@ -48,11 +169,10 @@ class SingleDialImageHandler:
                 self._add_pause_overlay_single(background)
 
             # Save single image
-            with self.image_handler.image_lock:
-                self.single_image = BytesIO()
-                background = background.convert("RGB")
-                background.save(self.single_image, format="JPEG", quality=100)
-                self.single_image.seek(0)
+            self._save_single_image(background)
+            # A frame showing the placeholder is redrawn until the cover loads
+            if has_cover:
+                self._last_render_key = render_key
 
             return True
 
@@ -60,8 +180,41 @@ class SingleDialImageHandler:
             logger.error(f"Error creating single dial image: {str(e)}")
             return False
 
+    def _save_single_image(self, background, cache_key=None):
+        """Encode the single dial image and publish it as immutable bytes.
+
+        Images saved with a cache_key can be published again later with
+        _publish_cached_single_image() without being redrawn or re-encoded.
+        """
+        # Every canvas is created as RGB and overlays are pasted with a mask,
+        # so the image is already in a JPEG-ready mode. Same settings as the
+        # touchbar images.
+        single_image = self.image_handler.encode_jpeg(background)
+        etag = hashlib.blake2b(single_image, digest_size=8).hexdigest()
+        self.snapshot = (single_image, etag)
+        self._last_render_key = None
+        if cache_key is not None:
+            with self.image_lock:
+                self.message_image_cache[cache_key] = self.snapshot
+                if len(self.message_image_cache) > MESSAGE_IMAGE_CACHE_SIZE:
+                    self.message_image_cache.popitem(last=False)
+
+    def _publish_cached_single_image(self, cache_key):
+        """Publish an image previously saved under cache_key, if any."""
+        with self.image_lock:
+            snapshot = self.message_image_cache.get(cache_key)
+            if snapshot is None:
+                return False
+            self.message_image_cache.move_to_end(cache_key)
+        self.snapshot = snapshot
+        self._last_render_key = None
+        return True
+
     def _add_single_album_cover(self, background, track_data):
-        """Add album cover to the top right corner (50x50)."""
+        """Add album cover to the top right corner (50x50).
+
+        Returns False if the placeholder was pasted instead of the cover.
+        """
         try:
             # Check if image_url exists in track_data
             if "image_url" not in track_data:
@@ -69,36 +222,32 @@ class SingleDialImageHandler:
                 raise ValueError("No image_url available")
             
             image_url = track_data["image_url"]
-            logger.debug(f"Loading album cover from: {image_url}")
+            logger.debug("Loading album cover from: %s", image_url)
 
-            # Use cached image if URL hasn't changed
-            if image_url == self.image_handler.current_image_url and image_url in self.image_handler.album_art_cache:
-                album_art = self.image_handler.album_art_cache[image_url]
-                logger.debug("Using cached album art")
+            thumbnail = self.cover_thumbnail
+            if thumbnail is not None and thumbnail[0] == image_url:
+                album_art = thumbnail[1]
             else:
-                # Download and cache new image
-                logger.debug("Downloading new album art...")
-                response = requests.get(image_url, timeout=10)
-                response.raise_for_status()  # Raise exception for bad status codes
-                album_art = Image.open(BytesIO(response.content))
-                # Update cache
-                self.image_handler.album_art_cache = {image_url: album_art}  # Only keep latest image
-                self.image_handler.current_image_url = image_url
-                logger.debug("Successfully downloaded and cached album art")
-
-            # Resize to 50x50 and place in top right
-            album_art = album_art.resize((50, 50), Image.Resampling.LANCZOS)
+                album_art = self.image_handler.get_album_art(image_url)
+
+                # Resize to 50x50 once per cover; an exact 2:1 shrink of the
+                # cached 100x100 art, so BOX averaging needs no wider kernel
+                album_art = album_art.resize((50, 50), Image.Resampling.BOX)
+                self.cover_thumbnail = (image_url, album_art)
+
+            # Place in top right
             background.paste(album_art, (150, 0))
             logger.debug("Album art successfully pasted to image")
+            return True
 
         except Exception as e:
             logger.error(f"Error loading album cover for single dial: {str(e)}")
             logger.error(f"Track data keys: {list(track_data.keys()) if track_data else 'No track_data'}")
-            # Create placeholder if image fails
-            placeholder = Image.new("RGB", (50, 50), "#1a1a1a")
-            background.paste(placeholder, (150, 0))
+            # Use placeholder if image fails
+            background.paste(self.cover_placeholder, (150, 0))
+            return False
 
-    def _add_single_dial_track_info(self, draw, track_data, override_progress):
+    def _add_single_dial_track_info(self, draw, track_data):
         """Add track info optimized for single dial display."""
         title_font = get_unicode_font(16)
         artist_font = get_unicode_font(14)
@@ -108,106 +257,45 @@ class SingleDialImageHandler:
         self._draw_track_name_multiline(draw, track_name, title_font, 140)
 
         # Artists (after track name, full width as it's below cover)
-        artists = self._truncate_text(track_data["artists"], artist_font, 180)
+        artists = truncate_text(track_data["artists"], artist_font, 180)
         draw.text((10, 55), artists, fill="#B3B3B3", font=artist_font)
 
-        # Progress bar (bottom)
-        current_progress = self._get_progress_single(override_progress, track_data)
-        self._create_single_progress_bar(draw, current_progress)
-
     def _draw_track_name_multiline(self, draw, track_name, font, max_width):
         """Draw track name on multiple lines if needed."""
-        # Check if the text fits on one line
-        if font.getlength(track_name) <= max_width:
-            draw.text((10, 8), track_name, fill="white", font=font)
-            return
-        
-        # Split into words for wrapping
-        words = track_name.split()
-        lines = []
-        current_line = []
-        
-        for word in words:
-            current_line.append(word)
-            test_line = " ".join(current_line)
-            
-            if font.getlength(test_line) > max_width:
-                if len(current_line) > 1:
-                    # Remove the word that made it too long
-                    current_line.pop()
-                    lines.append(" ".join(current_line))
-                    current_line = [word]
-                else:
-                    # Single word is too long, truncate it
-                    lines.append(self._truncate_text(word, font, max_width))
-                    current_line = []
-        
-        # Add remaining words
-        if current_line:
-            lines.append(" ".join(current_line))
-        
         # Draw the lines (maximum 2 lines)
-        for i, line in enumerate(lines[:2]):
+        for i, line in enumerate(_wrap_track_name(track_name, font, max_width)):
             draw.text((10, 8 + i * 20), line, fill="white", font=font)
 
-    def _create_single_progress_bar(self, draw, current_progress):
+    def _create_single_progress_bar(self, background, progress_width):
         """Create a progress bar for single dial."""
-        # Background bar (moved to bottom)
-        draw.rounded_rectangle([10, 80, 175, 83], radius=1, fill="#404040")
-        
-        # Progress bar
-        if current_progress is not None:
-            progress_width = int(165 * current_progress)
-            draw.rounded_rectangle([10, 80, 10 + progress_width, 83], radius=1, fill="#1DB954")
-
-    def _get_progress_single(self, override_progress, track_data):
-        """Get progress for single dial."""
-        if override_progress is not None:
-            return override_progress
-        
-        if "progress_ms" in track_data and "duration_ms" in track_data:
-            if track_data["duration_ms"] > 0:
-                return track_data["progress_ms"] / track_data["duration_ms"]
-        
-        return None
+        # Background and progress bars (bottom), drawn once per width
+        background.paste(_progress_bar_sprite(progress_width), (10, 80))
 
-    def _add_heart_icon_single(self, background, is_liked):
-        """Add heart icon for single dial (next to progress bar)."""
-        icon_filename = "spotify-liked.png" if is_liked else "spotify-like.png"
-        icon_path = os.path.join(os.path.dirname(__file__), icon_filename)
-        
+    def _load_heart_icon_single(self, icon_path):
+        """Load a heart icon resized to 14x14, or None if it can't be read."""
         try:
             heart_image = Image.open(icon_path)
-            heart_image = heart_image.resize((14, 14), Image.Resampling.LANCZOS)
-            
-            if heart_image.mode == 'RGBA':
-                background.paste(heart_image, (180, 75), heart_image)
-            else:
-                background.paste(heart_image, (180, 75))
+            return heart_image.resize((14, 14), Image.Resampling.LANCZOS)
         except FileNotFoundError:
             logger.warning(f"Warning: Heart icon file not found: {icon_path}")
         except Exception as e:
             logger.error(f"Error loading heart icon: {str(e)}")
+        return None
+
+    def _add_heart_icon_single(self, background, is_liked):
+        """Add heart icon for single dial (next to progress bar)."""
+        heart_image = self.heart_icons[bool(is_liked)]
+        if heart_image is None:
+            return
+
+        if heart_image.mode == 'RGBA':
+            background.paste(heart_image, (180, 75), heart_image)
+        else:
+            background.paste(heart_image, (180, 75))
 
     def _add_pause_overlay_single(self, background):
         """Add pause overlay for single dial."""
-        overlay = Image.new("RGBA", (200, 100), (0, 0, 0, 64))
-        draw_overlay = ImageDraw.Draw(overlay)
-
-        # Pause bars centered on the entire width
-        bar_width = 6
-        bar_height = 20
-        spacing = 6
-        start_x = (200 - (2 * bar_width + spacing)) // 2  # Center on full width (200px)
-        start_y = (100 - bar_height) // 2
-
-        for x in (start_x, start_x + bar_width + spacing):
-            draw_overlay.rectangle(
-                [x, start_y, x + bar_width, start_y + bar_height],
-                fill="white",
-            )
-
-        background.paste(overlay, (0, 0), overlay)
+        background.paste(_PAUSE_OVERLAY_SINGLE, (0, 0), _PAUSE_OVERLAY_SINGLE)
 
     def _format_time(self, ms):
         """Format milliseconds to mm:ss format."""
@@ -219,16 +307,11 @@ class SingleDialImageHandler:
         seconds = seconds % 60
         return f"{minutes}:{seconds:02d}"
 
-    def _truncate_text(self, text, font, max_width):
-        """Truncate text to fit within max_width."""
-        if font.getlength(text) > max_width:
-            while font.getlength(text + "...") > max_width:
-                text = text[:-1]
-            text += "..."
-        return text
-
     def create_single_dial_login_image(self):
         """Create single dial login message."""
+        if self._publish_cached_single_image("login"):
+            return
+
         background = Image.new("RGB", (200, 100), "black")
         draw = ImageDraw.Draw(background)
 
@@ -238,14 +321,14 @@ class SingleDialImageHandler:
         draw.text((10, 20), "Please Login", fill="white", font=font)
         draw.text((10, 45), "to Spotify", fill="white", font=font)
 
-        with self.image_handler.image_lock:
-            self.single_image = BytesIO()
-            background = background.convert("RGB")
-            background.save(self.single_image, format="JPEG", quality=100)
-            self.single_image.seek(0)
+        self._save_single_image(background, cache_key="login")
 
     def create_single_dial_error_image(self, error_message):
         """Create single dial error message."""
+        cache_key = ("error", error_message)
+        if self._publish_cached_single_image(cache_key):
+            return
+
         background = Image.new("RGB", (200, 100), "black")
         draw = ImageDraw.Draw(background)
 
@@ -261,14 +344,13 @@ class SingleDialImageHandler:
         
         draw.text((10, 50), error_message, fill="white", font=desc_font)
 
-        with self.image_handler.image_lock:
-            self.single_image = BytesIO()
-            background = background.convert("RGB")
-            background.save(self.single_image, format="JPEG", quality=100)
-            self.single_image.seek(0)
+        self._save_single_image(background, cache_key=cache_key)
 
     def create_single_dial_no_track_image(self):
         """Create single dial no track message."""
+        if self._publish_cached_single_image("no_track"):
+            return
+
         background = Image.new("RGB", (200, 100), "black")
         draw = ImageDraw.Draw(background)
 
@@ -276,8 +358,7 @@ class SingleDialImageHandler:
         small_font = get_unicode_font(14)
 
         # Add placeholder cover (dark area)
-        placeholder = Image.new("RGB", (50, 50), "#1a1a1a")
-        background.paste(placeholder, (150, 0))
+        background.paste(self.cover_placeholder, (150, 0))
 
         # Main message (avoid cover area)
         main_text = "No track"
@@ -292,7 +373,7 @@ class SingleDialImageHandler:
         draw.text((10, 60), sub_text, fill="#B3B3B3", font=small_font)
 
         # Add empty progress bar background
-        draw.rounded_rectangle([10, 80, 175, 83], radius=1, fill="#404040")
+        self._create_single_progress_bar(background, None)
 
         # Add pause overlay
         self._add_pause_overlay_single(background)
@@ -300,8 +381,4 @@ class SingleDialImageHandler:
         # Add heart icon (not liked)
         self._add_heart_icon_single(background, False)
 
-        with self.image_handler.image_lock:
-            self.single_image = BytesIO()
-            background = background.convert("RGB")
-            background.save(self.single_image, format="JPEG", quality=100)
-            self.single_image.seek(0) 
\ No newline at end of file
+        self._save_single_image(background, cache_key="no_track") 
\ No newline at end of file